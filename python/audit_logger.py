@@ -13,10 +13,14 @@ Author: SentinAL Security Team
 Date: 2026-01-23
 """
 
+import asyncio
+import atexit
+import base64
 import logging
 import logging.handlers
-import json
+import orjson
 import os
+import queue
 import hmac
 import hashlib
 import time
@@ -28,10 +32,21 @@ from typing import Dict, Any, Optional
 LOG_DIR = Path("logs/audit")
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "default-secret-key-change-in-prod").encode()
 
+# Log entries have a fixed schema; listing the keys pre-sorted lets the
+# canonical form be built by construction instead of paying orjson's
+# sort-keys comparator on every event.
+CANONICAL_KEYS = (
+    "action", "details", "environment", "event_type",
+    "status", "timestamp", "user_id", "version",
+)
+
 class AuditLogger:
     def __init__(self):
         self._setup_logger()
-    
+        # HMAC key schedule (ipad/opad SHA-256 compressions) computed once;
+        # per-event signing copies this template instead of redoing it.
+        self._hmac_template = hmac.new(SECRET_KEY, b"", hashlib.sha256)
+
     def _setup_logger(self):
         """Initialize the audit logger with file rotation"""
         LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -51,14 +66,45 @@ class AuditLogger:
         
         formatter = logging.Formatter('%(message)s')
         handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+
+        # Emit through a queue so callers never block on file I/O or the
+        # handler lock; the listener thread owns the actual write.
+        log_queue = queue.Queue(-1)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._log_queue = log_queue
+        self._listener = logging.handlers.QueueListener(log_queue, handler)
+        self._listener.start()
+        atexit.register(self.close)
+
+    def flush(self):
+        """Block until every queued record is written to disk.
+
+        log_event returns before the listener thread performs the write,
+        so read-after-write consumers (tests, report tools run right
+        after logging) must call this before opening the log file.
+        """
+        if self._listener is not None:
+            # The listener marks each record done after handling it
+            self._log_queue.join()
+            for handler in self._listener.handlers:
+                handler.flush()
+
+    def close(self):
+        """Stop the listener thread, flushing pending records (idempotent)"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
         
     def _sign_entry(self, entry: Dict[str, Any]) -> str:
         """Generate HMAC-SHA256 signature for the log entry"""
-        # Sort keys to ensure consistent signature
-        serialized = json.dumps(entry, sort_keys=True).encode()
-        signature = hmac.new(SECRET_KEY, serialized, hashlib.sha256).hexdigest()
-        return signature
+        # Keys are emitted in CANONICAL_KEYS order, which is sorted, so
+        # the bytes match what a sort-keys dump would produce; orjson
+        # emits bytes directly, so the HMAC input needs no encode step
+        serialized = orjson.dumps({k: entry[k] for k in CANONICAL_KEYS if k in entry})
+        signer = self._hmac_template.copy()
+        signer.update(serialized)
+        # base64 (44 chars) over hex (64): shorter lines, cheaper encode
+        return base64.b64encode(signer.digest()).decode("ascii")
 
     def log_event(self, 
                   event_type: str, 
@@ -92,15 +138,79 @@ class AuditLogger:
             "environment": os.getenv("ENVIRONMENT", "development")
         }
         
-        # Add signature
-        log_entry["signature"] = self._sign_entry(log_entry)
-        
-        # Write structured log
-        self.logger.info(json.dumps(log_entry))
+        # Serialize once: the canonical payload bytes are both the HMAC
+        # input and, with the signature spliced onto the end, the exact
+        # line written to disk — so verification can authenticate the
+        # raw stored bytes without re-parsing and re-serializing.
+        payload = orjson.dumps({k: log_entry[k] for k in CANONICAL_KEYS})
+        signer = self._hmac_template.copy()
+        signer.update(payload)
+        signature = base64.b64encode(signer.digest()).decode("ascii")
+
+        self.logger.info('%s,"signature":"%s"}' % (payload[:-1].decode(), signature))
 
 # Global instance
 audit_logger = AuditLogger()
 
+# Async writer: when started (API startup), events are queued and signed/
+# written by a background task instead of on the request path. Outside an
+# event loop (CLI tools, tests) log_audit_event writes synchronously.
+AUDIT_QUEUE_SIZE = 10000
+AUDIT_BATCH_SIZE = 256
+
+_audit_queue: Optional[asyncio.Queue] = None
+_drain_task: Optional[asyncio.Task] = None
+_dropped_events = 0
+
+
+async def _audit_drain(queue: asyncio.Queue):
+    """Drain queued events in batches so bursts amortize wakeups"""
+    while True:
+        batch = [await queue.get()]
+        while not queue.empty() and len(batch) < AUDIT_BATCH_SIZE:
+            batch.append(queue.get_nowait())
+        for event_type, kwargs in batch:
+            audit_logger.log_event(event_type, **kwargs)
+
+
+def start_audit_writer():
+    """Start the background audit writer (call from app startup)"""
+    global _audit_queue, _drain_task
+    if _drain_task is not None:
+        return
+    _audit_queue = asyncio.Queue(maxsize=AUDIT_QUEUE_SIZE)
+    _drain_task = asyncio.get_running_loop().create_task(_audit_drain(_audit_queue))
+
+
+async def stop_audit_writer():
+    """Stop the writer and flush anything still queued (call from shutdown)"""
+    global _audit_queue, _drain_task
+    if _drain_task is None:
+        return
+    _drain_task.cancel()
+    try:
+        await _drain_task
+    except asyncio.CancelledError:
+        pass
+    while not _audit_queue.empty():
+        event_type, kwargs = _audit_queue.get_nowait()
+        audit_logger.log_event(event_type, **kwargs)
+    audit_logger.flush()
+    _audit_queue = None
+    _drain_task = None
+
+
 def log_audit_event(event_type: str, **kwargs):
     """Helper function to log events easily"""
+    global _dropped_events
+    if _audit_queue is not None:
+        try:
+            _audit_queue.put_nowait((event_type, kwargs))
+        except asyncio.QueueFull:
+            # Drop rather than block the request path; count for monitoring
+            _dropped_events += 1
+            logging.getLogger(__name__).warning(
+                f"Audit queue full, dropped event ({_dropped_events} total)"
+            )
+        return
     audit_logger.log_event(event_type, **kwargs)
@@ -8,12 +8,14 @@ Date: 2026-01-23
 """
 
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 import hashlib
 import secrets
 
 import jwt
+from cachetools import TTLCache
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from dotenv import load_dotenv
@@ -26,6 +28,10 @@ load_dotenv()
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "CHANGE_THIS_IN_PRODUCTION")
 REFRESH_SECRET_KEY = os.getenv("JWT_REFRESH_SECRET_KEY", "CHANGE_THIS_REFRESH_KEY_IN_PRODUCTION")
 ALGORITHM = "HS256"
+
+# PyJWT re-encodes a str key to bytes on every call; hand it bytes once
+SECRET_KEY_BYTES = SECRET_KEY.encode()
+REFRESH_SECRET_KEY_BYTES = REFRESH_SECRET_KEY.encode()
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRATION_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_REFRESH_EXPIRATION_DAYS", "7"))
 
@@ -35,8 +41,21 @@ security = HTTPBearer()
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# Token blacklist (in-memory for now, should use Redis in production)
-token_blacklist = set()
+# Token blacklist (in-memory for now, should use Redis in production).
+# Bounded TTL cache rather than a bare set: revoked refresh tokens only
+# matter until their own expiry, so entries age out instead of growing
+# the process forever.
+token_blacklist = TTLCache(
+    maxsize=100_000, ttl=REFRESH_TOKEN_EXPIRE_DAYS * 86400
+)
+
+# Verified-token cache: signature verification costs an HMAC per request
+# even though clients resend the same bearer token for its whole lifetime.
+# Entries live at most TOKEN_CACHE_TTL_SECONDS (and never past the token's
+# own exp claim), so revocation and expiry lag by seconds, not minutes.
+TOKEN_CACHE_TTL_SECONDS = 30
+TOKEN_CACHE_MAX_SIZE = 10000
+_token_cache = {}
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -61,7 +80,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
     
     return encoded_jwt
 
@@ -85,9 +104,19 @@ def verify_token(credentials: HTTPAuthorizationCredentials) -> str:
         >>> async def protected_route(user_id: str = Depends(verify_token)):
         >>>     return {"user": user_id}
     """
+    token = credentials.credentials
+
+    cached = _token_cache.get(token)
+    if cached is not None:
+        user_id, valid_until = cached
+        if time.time() < valid_until:
+            return user_id
+        # pop, not del: two threadpool requests can race on the same
+        # just-expired entry, and the loser must not raise KeyError
+        _token_cache.pop(token, None)
+
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         
         if user_id is None:
@@ -97,6 +126,15 @@ def verify_token(credentials: HTTPAuthorizationCredentials) -> str:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        # Cache the verified result, bounded by the token's own expiry
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            _token_cache.clear()
+        valid_until = time.time() + TOKEN_CACHE_TTL_SECONDS
+        exp = payload.get("exp")
+        if exp is not None:
+            valid_until = min(valid_until, float(exp))
+        _token_cache[token] = (user_id, valid_until)
+
         return user_id
         
     except jwt.ExpiredSignatureError:
@@ -145,7 +183,7 @@ def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, REFRESH_SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, REFRESH_SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -163,7 +201,7 @@ def verify_refresh_token(token: str) -> str:
         HTTPException: If token is invalid or expired
     """
     try:
-        payload = jwt.decode(token, REFRESH_SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, REFRESH_SECRET_KEY_BYTES, algorithms=[ALGORITHM])
         
         if payload.get("type") != "refresh":
             raise HTTPException(
@@ -207,7 +245,9 @@ def blacklist_token(token: str):
     Args:
         token: Token to blacklist
     """
-    token_blacklist.add(token)
+    token_blacklist[token] = True
+    # Revoked tokens must not be served from the verification cache
+    _token_cache.pop(token, None)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -238,18 +278,20 @@ def get_password_hash(password: str) -> str:
 
 
 # Demo user database (in production, use a real database)
+# Hashes are precomputed bcrypt of "demo123" / "admin123": hashing them at
+# import cost ~0.5s of worker cold-start for values that never change.
 DEMO_USERS = {
     "demo@sentinal.ai": {
         "id": "demo_user_001",
         "email": "demo@sentinal.ai",
         "username": "Demo Analyst",
-        "hashed_password": get_password_hash("demo123"),
+        "hashed_password": "$2b$12$OSdqvVtM1VGXiaSq25M56OJrk2cIi0JJokWpTBmbXZw0D94lbM9o6",
     },
     "admin@sentinal.ai": {
         "id": "admin_user_001",
         "email": "admin@sentinal.ai",
         "username": "Admin User",
-        "hashed_password": get_password_hash("admin123"),
+        "hashed_password": "$2b$12$S/zioWv.tuPcdKfitCYiFu3eslMKbEXpqIpDPQUUYdreGJ8Hnxctm",
     },
 }
 
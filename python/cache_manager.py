@@ -16,6 +16,7 @@ Date: 2026-01-24
 
 import json
 import logging
+import orjson
 import os
 from typing import Optional, Any, Dict
 from functools import lru_cache
@@ -34,6 +35,12 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("Redis not installed. Falling back to in-memory cache.")
 
+try:
+    import redis.asyncio as aioredis
+    AIOREDIS_AVAILABLE = True
+except ImportError:
+    AIOREDIS_AVAILABLE = False
+
 
 class CacheManager:
     """
@@ -132,6 +139,36 @@ class CacheManager:
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
     
+    def get_obj(self, key: str) -> Optional[Any]:
+        """
+        Get a structured value from cache.
+
+        Counterpart to set_obj; decodes with orjson, which is several
+        times faster than stdlib json on the nested dict/list payloads
+        cached here (explanations, graph snapshots).
+        """
+        raw = self.get(key)
+        if raw is None:
+            return None
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            logger.error(f"Cache get_obj decode error for key {key}")
+            return None
+
+    def set_obj(self, key: str, obj: Any, ttl: int = 3600):
+        """
+        Set a structured value in cache with TTL.
+
+        Serializes with orjson rather than msgpack: the connection pool
+        runs decode_responses=True so values travel as UTF-8 strings,
+        which a binary format would need a second pool to carry.
+        """
+        try:
+            self.set(key, orjson.dumps(obj).decode(), ttl=ttl)
+        except (TypeError, orjson.JSONEncodeError) as e:
+            logger.error(f"Cache set_obj encode error for key {key}: {e}")
+
     def delete(self, key: str):
         """Delete key from cache."""
         try:
@@ -154,10 +191,21 @@ class CacheManager:
         """
         try:
             if self.redis_client:
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    self.redis_client.delete(*keys)
-                    logger.info(f"Cleared {len(keys)} keys matching pattern: {pattern}")
+                # SCAN walks the keyspace incrementally instead of KEYS'
+                # single O(N) blocking sweep, and UNLINK reclaims memory
+                # on a background thread rather than inline
+                cleared = 0
+                cursor = 0
+                while True:
+                    cursor, batch = self.redis_client.scan(
+                        cursor, match=pattern, count=1000
+                    )
+                    if batch:
+                        self.redis_client.unlink(*batch)
+                        cleared += len(batch)
+                    if cursor == 0:
+                        break
+                logger.info(f"Cleared {cleared} keys matching pattern: {pattern}")
             else:
                 # Fallback: clear all keys starting with pattern prefix
                 prefix = pattern.replace("*", "")
@@ -169,6 +217,13 @@ class CacheManager:
         except Exception as e:
             logger.error(f"Cache clear pattern error for {pattern}: {e}")
     
+    def _redis_version(self, info: Dict[str, Any]) -> Optional[str]:
+        """Server version from an info() payload, cached after first read
+        (it cannot change while we hold the connection)."""
+        if not hasattr(self, "_cached_redis_version"):
+            self._cached_redis_version = info.get("redis_version")
+        return self._cached_redis_version
+
     def health_check(self) -> Dict[str, Any]:
         """
         Check cache health and return statistics.
@@ -185,13 +240,18 @@ class CacheManager:
         
         try:
             if self.redis_client:
-                # Test Redis connection
-                self.redis_client.ping()
-                info = self.redis_client.info("stats")
-                
+                # One pipelined round trip instead of four (ping + two
+                # info calls + dbsize); a single info() carries both the
+                # stats and server sections.
+                pipe = self.redis_client.pipeline()
+                pipe.ping()
+                pipe.info()
+                pipe.dbsize()
+                _, info, dbsize = pipe.execute()
+
                 health["status"] = "healthy"
-                health["redis_version"] = self.redis_client.info("server").get("redis_version")
-                health["total_keys"] = self.redis_client.dbsize()
+                health["redis_version"] = self._redis_version(info)
+                health["total_keys"] = dbsize
                 health["hits"] = info.get("keyspace_hits", 0)
                 health["misses"] = info.get("keyspace_misses", 0)
                 
@@ -211,10 +271,83 @@ class CacheManager:
         return health
 
 
-# Global cache manager instance
+class AsyncCacheManager:
+    """
+    Async twin of CacheManager for use inside FastAPI handlers.
+
+    A synchronous cache call inside an async endpoint blocks the event
+    loop for the whole Redis round trip, serializing every concurrent
+    request on that worker; this variant awaits the round trip instead.
+    The sync CacheManager stays for scripts and startup code.
+    """
+
+    def __init__(self):
+        self.redis_enabled = os.getenv("REDIS_ENABLED", "true").lower() == "true"
+        self.redis_client = None
+        self.fallback_cache = {}
+
+        if AIOREDIS_AVAILABLE and self.redis_enabled:
+            try:
+                pool = aioredis.ConnectionPool(
+                    host=os.getenv("REDIS_HOST", "localhost"),
+                    port=int(os.getenv("REDIS_PORT", "6379")),
+                    db=int(os.getenv("REDIS_DB", "0")),
+                    password=os.getenv("REDIS_PASSWORD", None) or None,
+                    decode_responses=True,
+                    max_connections=10,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                )
+                self.redis_client = aioredis.Redis(connection_pool=pool)
+            except Exception as e:
+                logger.warning(f"Failed to set up async Redis: {e}. Using in-memory cache.")
+                self.redis_client = None
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Get value from cache without blocking the event loop."""
+        if self.redis_client:
+            try:
+                return await self.redis_client.get(key)
+            except Exception as e:
+                # Connection problems demote us to the in-memory cache,
+                # mirroring the sync manager's fallback behavior
+                logger.warning(f"Async Redis unavailable ({e}); using in-memory cache.")
+                self.redis_client = None
+        return self.fallback_cache.get(key)
+
+    async def aset(self, key: str, value: str, ttl: int = 3600):
+        """Set value in cache with TTL without blocking the event loop."""
+        if self.redis_client:
+            try:
+                await self.redis_client.setex(key, ttl, value)
+                return
+            except Exception as e:
+                logger.warning(f"Async Redis unavailable ({e}); using in-memory cache.")
+                self.redis_client = None
+        self.fallback_cache[key] = value
+
+    async def adelete(self, key: str):
+        """Delete key from cache without blocking the event loop."""
+        if self.redis_client:
+            try:
+                await self.redis_client.unlink(key)
+                return
+            except Exception as e:
+                logger.warning(f"Async Redis unavailable ({e}); using in-memory cache.")
+                self.redis_client = None
+        self.fallback_cache.pop(key, None)
+
+
+# Global cache manager instances
 cache_manager = CacheManager()
+async_cache_manager = AsyncCacheManager()
 
 
 def get_cache_manager() -> CacheManager:
     """Get the global cache manager instance."""
     return cache_manager
+
+
+def get_async_cache() -> AsyncCacheManager:
+    """Get the global async cache manager (FastAPI dependency)."""
+    return async_cache_manager
@@ -15,19 +15,91 @@ Date: 2026-01-23
 
 import networkx as nx
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import random
 import torch
 from torch_geometric.data import Data
 import pickle
 import os
 
+# Try to import Numba for JIT-compiled edge generation, but don't fail
+# if unavailable — the NumPy fallback produces identical output
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Joblib parallelizes large normal-transaction batches across cores;
+# generation falls back to a single worker without it
+try:
+    from joblib import Parallel, delayed
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
 # Set random seeds for reproducibility
 random.seed(42)
 np.random.seed(42)
 torch.manual_seed(42)
 
 
+# Below this many transactions a worker pool costs more in process
+# startup and result pickling than the draws themselves
+PARALLEL_TX_THRESHOLD = 100_000
+
+
+def _normal_tx_chunk(seed, n, num_users, num_types):
+    """One worker's slice of normal-transaction columns.
+
+    Each slice draws from its own seeded generator, so slices are
+    independent and can run on any core; self-transfers are dropped.
+    """
+    rng = np.random.default_rng(seed)
+    src = rng.integers(0, num_users, size=n)
+    dst = rng.integers(0, num_users, size=n)
+    mask = src != dst
+    src = src[mask]
+    dst = dst[mask]
+    m = len(src)
+    amount = np.clip(np.round(rng.lognormal(mean=4.5, sigma=1.5, size=m), 2), 10, 5000)
+    type_id = rng.integers(0, num_types, size=m)
+    hour = rng.integers(0, 721, size=m)
+    return src, dst, amount, type_id, hour
+
+
+def _timestamp_array(base, offsets):
+    """Edge timestamp column: one vectorized datetime64 add replaces a
+    timedelta construction and datetime.__add__ per edge."""
+    stamps = np.datetime64(base) + offsets
+    return stamps.astype('datetime64[us]').tolist()
+
+
+def _cycle_edges_numpy(users, base, decay):
+    """Ring edge columns: each user pays its successor a decaying amount."""
+    return users, np.roll(users, -1), base * decay ** np.arange(users.shape[0])
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _cycle_edges(users, base, decay):
+        # Tight compiled loop: negligible at ring_size=5, but the win
+        # when sweeping large rings for data augmentation
+        n = users.shape[0]
+        src = np.empty(n, dtype=np.int64)
+        dst = np.empty(n, dtype=np.int64)
+        amount = np.empty(n, dtype=np.float64)
+        scale = 1.0
+        for i in range(n):
+            src[i] = users[i]
+            dst[i] = users[(i + 1) % n]
+            amount[i] = base * scale
+            scale *= decay
+        return src, dst, amount
+else:
+    _cycle_edges = _cycle_edges_numpy
+
+
 class EnhancedFinancialGraphGenerator:
     """
     Generates synthetic financial transaction networks with multiple fraud patterns.
@@ -37,28 +109,84 @@ class EnhancedFinancialGraphGenerator:
         self.num_users = num_users
         self.graph = nx.DiGraph()
         self.transaction_types = ['payment', 'transfer', 'withdrawal']
-        self.fraud_users = set()
+        self._type_to_int = {t: i for i, t in enumerate(self.transaction_types)}
+        # Edge data is also kept as parallel arrays (structure-of-arrays)
+        # while the graph is built, so to_pytorch_geometric can hand the
+        # numeric columns to torch without re-walking NetworkX dicts.
+        # Columns are preallocated and written at an offset; callers that
+        # know their workload can size them once via plan_capacity.
+        self._edge_capacity = 1024
+        self._edge_count = 0
+        self._edge_src = np.empty(self._edge_capacity, dtype=np.int64)
+        self._edge_dst = np.empty(self._edge_capacity, dtype=np.int64)
+        self._edge_amount = np.empty(self._edge_capacity, dtype=np.float64)
+        self._edge_type_id = np.empty(self._edge_capacity, dtype=np.int64)
+        self._edge_slot = {}
+        self._pyg_cache = None
+        # Non-fraud users as a boolean mask: flipping a bit when a user
+        # joins a pattern replaces the O(N) set-difference comprehension
+        # each injector ran to find available users
+        self._available = np.ones(num_users, dtype=bool)
+        # Node feature columns, filled by generate_user_features and
+        # handed to torch without re-reading the graph's node dicts
+        self._ages = np.zeros(num_users, dtype=np.int64)
+        self._risks = np.zeros(num_users, dtype=np.float64)
+
+    def plan_capacity(self, total_edges):
+        """Size the edge columns for a known workload up front, so no
+        doubling reallocation happens mid-generation."""
+        if total_edges > self._edge_capacity:
+            self._grow(total_edges)
+
+    def _grow(self, capacity):
+        for name in ('_edge_src', '_edge_dst', '_edge_amount', '_edge_type_id'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._edge_count] = old[:self._edge_count]
+            setattr(self, name, new)
+        self._edge_capacity = capacity
+
+    def _record_edge(self, from_user, to_user, amount, tx_type):
+        """Mirror an edge into the SoA columns (repeat edges overwrite,
+        matching DiGraph.add_edge semantics)."""
+        idx = self._edge_slot.get((from_user, to_user))
+        if idx is None:
+            if self._edge_count == self._edge_capacity:
+                self._grow(self._edge_capacity * 2)
+            idx = self._edge_count
+            self._edge_slot[(from_user, to_user)] = idx
+            self._edge_count += 1
+            self._edge_src[idx] = from_user
+            self._edge_dst[idx] = to_user
+        self._edge_amount[idx] = amount
+        self._edge_type_id[idx] = self._type_to_int[tx_type]
         
     def generate_user_features(self):
         """Generate realistic user node features."""
-        for user_id in range(self.num_users):
-            account_age = random.randint(30, 1825)
-            risk_score = np.random.beta(2, 5)
-            
-            self.graph.add_node(
+        # One draw per attribute and a single batch insert; the raw
+        # columns stay around for tensor creation
+        self._ages = np.random.randint(30, 1826, self.num_users)
+        self._risks = np.random.beta(2, 5, self.num_users)
+        
+        self.graph.add_nodes_from(
+            (
                 user_id,
-                account_age_days=account_age,
-                risk_score_initial=risk_score,
-                is_fraud=0,
-                fraud_pattern=None
+                {
+                    'account_age_days': int(self._ages[user_id]),
+                    'risk_score_initial': float(self._risks[user_id]),
+                    'is_fraud': 0,
+                    'fraud_pattern': None
+                }
             )
+            for user_id in range(self.num_users)
+        )
     
     def inject_cyclic_ring(self, ring_size=5):
         """
         Pattern 1: Cyclic Money Laundering Ring
         A → B → C → D → A (circular flow to obscure origin)
         """
-        available_users = [u for u in range(self.num_users) if u not in self.fraud_users]
+        available_users = np.flatnonzero(self._available).tolist()
         if len(available_users) < ring_size:
             print(f"⚠️  Not enough users for cyclic ring")
             return []
@@ -70,26 +198,39 @@ class EnhancedFinancialGraphGenerator:
         for user_id in fraud_users:
             self.graph.nodes[user_id]['is_fraud'] = 1
             self.graph.nodes[user_id]['fraud_pattern'] = 'cyclic_ring'
-            self.fraud_users.add(user_id)
+            self._available[user_id] = False
         
-        # Create cycle
+        # Create cycle: amounts decay 5% per hop, each user pays its
+        # successor (closing the ring), one batch insert. The edge
+        # columns come from the JIT-compiled helper when Numba is around.
         base_amount = 1000
         timestamp = datetime.now()
-        
-        for i in range(len(fraud_users)):
-            from_user = fraud_users[i]
-            to_user = fraud_users[(i + 1) % len(fraud_users)]
-            amount = base_amount * (0.95 ** i)
-            
-            self.graph.add_edge(
-                from_user, to_user,
-                amount=round(amount, 2),
-                timestamp=timestamp + timedelta(hours=i),
-                transaction_type='transfer',
-                is_fraud_edge=1,
-                pattern='cyclic_ring'
+
+        from_users, to_users, amounts = _cycle_edges(
+            np.asarray(fraud_users, dtype=np.int64), float(base_amount), 0.95
+        )
+        amounts = np.round(amounts, 2)
+        timestamps = _timestamp_array(
+            timestamp, np.arange(len(fraud_users), dtype='timedelta64[h]')
+        )
+
+        edges = [
+            (
+                int(from_users[i]), int(to_users[i]),
+                {
+                    'amount': float(amounts[i]),
+                    'timestamp': timestamps[i],
+                    'transaction_type': 'transfer',
+                    'is_fraud_edge': 1,
+                    'pattern': 'cyclic_ring'
+                }
             )
-        
+            for i in range(len(fraud_users))
+        ]
+        self.graph.add_edges_from(edges)
+        for from_user, to_user, attrs in edges:
+            self._record_edge(from_user, to_user, attrs['amount'], 'transfer')
+
         return fraud_users
     
     def inject_fanout_pattern(self, source_user=None, num_targets=10):
@@ -97,7 +238,7 @@ class EnhancedFinancialGraphGenerator:
         Pattern 2: Fan-Out (Layering)
         One source → Many destinations (money laundering layering phase)
         """
-        available_users = [u for u in range(self.num_users) if u not in self.fraud_users]
+        available_users = np.flatnonzero(self._available).tolist()
         if len(available_users) < num_targets + 1:
             print(f"⚠️  Not enough users for fan-out")
             return []
@@ -113,23 +254,32 @@ class EnhancedFinancialGraphGenerator:
         # Mark source as fraud
         self.graph.nodes[source_user]['is_fraud'] = 1
         self.graph.nodes[source_user]['fraud_pattern'] = 'fanout_source'
-        self.fraud_users.add(source_user)
+        self._available[source_user] = False
         
-        # Create fan-out edges
+        # Create fan-out edges in one batch
         timestamp = datetime.now()
         base_amount = 5000
+        amount = round(base_amount / num_targets, 2)  # Split money
+        timestamps = _timestamp_array(
+            timestamp, (np.arange(num_targets) * 5).astype('timedelta64[m]')
+        )
         
-        for i, target in enumerate(targets):
-            amount = base_amount / num_targets  # Split money
-            
-            self.graph.add_edge(
+        edges = [
+            (
                 source_user, target,
-                amount=round(amount, 2),
-                timestamp=timestamp + timedelta(minutes=i*5),
-                transaction_type='transfer',
-                is_fraud_edge=1,
-                pattern='fanout'
+                {
+                    'amount': amount,
+                    'timestamp': timestamps[i],
+                    'transaction_type': 'transfer',
+                    'is_fraud_edge': 1,
+                    'pattern': 'fanout'
+                }
             )
+            for i, target in enumerate(targets)
+        ]
+        self.graph.add_edges_from(edges)
+        for _, target, attrs in edges:
+            self._record_edge(source_user, target, amount, 'transfer')
         
         return [source_user] + targets
     
@@ -138,7 +288,7 @@ class EnhancedFinancialGraphGenerator:
         Pattern 3: Rapid-Fire (Automated Bot Attack)
         Many transactions in very short time window
         """
-        available_users = [u for u in range(self.num_users) if u not in self.fraud_users]
+        available_users = np.flatnonzero(self._available).tolist()
         if len(available_users) < 2:
             print(f"⚠️  Not enough users for rapid-fire")
             return []
@@ -151,23 +301,37 @@ class EnhancedFinancialGraphGenerator:
         # Mark as fraud
         self.graph.nodes[user_id]['is_fraud'] = 1
         self.graph.nodes[user_id]['fraud_pattern'] = 'rapidfire'
-        self.fraud_users.add(user_id)
+        self._available[user_id] = False
         
-        # Create rapid transactions
+        # Create rapid transactions: targets and amounts drawn in one
+        # shot (the old per-transaction comprehension rescanned the whole
+        # user range every iteration), edges added as a single batch
         timestamp = datetime.now()
         
-        for i in range(num_transactions):
-            target = random.choice([u for u in range(self.num_users) if u != user_id])
-            amount = random.uniform(50, 200)
-            
-            self.graph.add_edge(
-                user_id, target,
-                amount=round(amount, 2),
-                timestamp=timestamp + timedelta(seconds=i*3),  # 3 seconds apart!
-                transaction_type='payment',
-                is_fraud_edge=1,
-                pattern='rapidfire'
+        candidates = np.delete(np.arange(self.num_users), user_id)
+        targets = np.random.choice(candidates, size=num_transactions)
+        amounts = np.round(np.random.uniform(50, 200, num_transactions), 2)
+        # 3 seconds apart!
+        timestamps = _timestamp_array(
+            timestamp, (np.arange(num_transactions) * 3).astype('timedelta64[s]')
+        )
+        
+        edges = [
+            (
+                user_id, int(targets[i]),
+                {
+                    'amount': float(amounts[i]),
+                    'timestamp': timestamps[i],
+                    'transaction_type': 'payment',
+                    'is_fraud_edge': 1,
+                    'pattern': 'rapidfire'
+                }
             )
+            for i in range(num_transactions)
+        ]
+        self.graph.add_edges_from(edges)
+        for _, target, attrs in edges:
+            self._record_edge(user_id, target, attrs['amount'], 'payment')
         
         return [user_id]
     
@@ -176,7 +340,7 @@ class EnhancedFinancialGraphGenerator:
         Pattern 4: Scatter-Gather (Smurfing/Structuring)
         Many sources → Hub → Many targets (break up large amounts)
         """
-        available_users = [u for u in range(self.num_users) if u not in self.fraud_users]
+        available_users = np.flatnonzero(self._available).tolist()
         if len(available_users) < num_sources + num_targets + 1:
             print(f"⚠️  Not enough users for scatter-gather")
             return []
@@ -195,92 +359,138 @@ class EnhancedFinancialGraphGenerator:
         # Mark hub as fraud
         self.graph.nodes[hub_user]['is_fraud'] = 1
         self.graph.nodes[hub_user]['fraud_pattern'] = 'scatter_gather_hub'
-        self.fraud_users.add(hub_user)
+        self._available[hub_user] = False
         
         timestamp = datetime.now()
         
-        # Gather phase: sources → hub
-        for i, source in enumerate(sources):
-            amount = random.uniform(800, 1200)
-            self.graph.add_edge(
+        # Amounts for both phases drawn in one call each; gather and
+        # scatter edges land as a single batch
+        in_amounts = np.round(np.random.uniform(800, 1200, len(sources)), 2)
+        out_amounts = np.round(np.random.uniform(900, 1100, len(targets)), 2)
+        timestamps = _timestamp_array(
+            timestamp,
+            np.arange(len(sources) + len(targets), dtype='timedelta64[h]')
+        )
+        
+        edges = [
+            (
                 source, hub_user,
-                amount=round(amount, 2),
-                timestamp=timestamp + timedelta(hours=i),
-                transaction_type='transfer',
-                is_fraud_edge=1,
-                pattern='scatter_gather_in'
+                {
+                    'amount': float(in_amounts[i]),
+                    'timestamp': timestamps[i],
+                    'transaction_type': 'transfer',
+                    'is_fraud_edge': 1,
+                    'pattern': 'scatter_gather_in'
+                }
             )
-        
-        # Scatter phase: hub → targets
-        for i, target in enumerate(targets):
-            amount = random.uniform(900, 1100)
-            self.graph.add_edge(
+            for i, source in enumerate(sources)
+        ] + [
+            (
                 hub_user, target,
-                amount=round(amount, 2),
-                timestamp=timestamp + timedelta(hours=num_sources + i),
-                transaction_type='transfer',
-                is_fraud_edge=1,
-                pattern='scatter_gather_out'
+                {
+                    'amount': float(out_amounts[i]),
+                    'timestamp': timestamps[num_sources + i],
+                    'transaction_type': 'transfer',
+                    'is_fraud_edge': 1,
+                    'pattern': 'scatter_gather_out'
+                }
             )
+            for i, target in enumerate(targets)
+        ]
+        self.graph.add_edges_from(edges)
+        for from_user, to_user, attrs in edges:
+            self._record_edge(from_user, to_user, attrs['amount'], 'transfer')
         
         return sources + [hub_user] + targets
     
     def generate_normal_transactions(self, num_transactions=300):
         """Generate normal (non-fraudulent) transactions."""
         timestamp = datetime.now()
-        
-        for i in range(num_transactions):
-            from_user = random.randint(0, self.num_users - 1)
-            to_user = random.randint(0, self.num_users - 1)
-            
-            if from_user == to_user:
-                continue
-            
-            amount = round(np.random.lognormal(mean=4.5, sigma=1.5), 2)
-            amount = max(10, min(amount, 5000))
-            tx_type = random.choice(self.transaction_types)
-            
-            self.graph.add_edge(
-                from_user, to_user,
-                amount=amount,
-                timestamp=timestamp + timedelta(hours=random.randint(0, 720)),
-                transaction_type=tx_type,
-                is_fraud_edge=0,
-                pattern='normal'
+
+        # Columns come from _normal_tx_chunk: one vectorized draw per
+        # attribute. Large batches are partitioned across cores (each
+        # chunk gets its own seed from the module RNG, so runs stay
+        # reproducible); small ones run inline.
+        num_types = len(self.transaction_types)
+        if JOBLIB_AVAILABLE and num_transactions >= PARALLEL_TX_THRESHOLD:
+            n_jobs = os.cpu_count() or 1
+            counts = [num_transactions // n_jobs] * n_jobs
+            counts[0] += num_transactions % n_jobs
+            seeds = np.random.randint(0, 2**31 - 1, size=n_jobs)
+            parts = Parallel(n_jobs=n_jobs)(
+                delayed(_normal_tx_chunk)(int(seed), count, self.num_users, num_types)
+                for seed, count in zip(seeds, counts)
+            )
+            from_users, to_users, amounts, type_ids, hour_offsets = (
+                np.concatenate(cols) for cols in zip(*parts)
+            )
+        else:
+            from_users, to_users, amounts, type_ids, hour_offsets = _normal_tx_chunk(
+                int(np.random.randint(0, 2**31 - 1)), num_transactions,
+                self.num_users, num_types
+            )
+        n = len(from_users)
+        tx_types = [self.transaction_types[t] for t in type_ids]
+        timestamps = _timestamp_array(
+            timestamp, hour_offsets.astype('timedelta64[h]')
+        )
+
+        self.graph.add_edges_from(
+            (
+                int(from_users[i]), int(to_users[i]),
+                {
+                    'amount': float(amounts[i]),
+                    'timestamp': timestamps[i],
+                    'transaction_type': str(tx_types[i]),
+                    'is_fraud_edge': 0,
+                    'pattern': 'normal'
+                }
+            )
+            for i in range(n)
+        )
+        for i in range(n):
+            self._record_edge(
+                int(from_users[i]), int(to_users[i]),
+                float(amounts[i]), str(tx_types[i])
             )
     
     def to_pytorch_geometric(self):
-        """Convert NetworkX graph to PyTorch Geometric format."""
-        # Node features
-        node_features = []
-        node_labels = []
-        
-        for node_id in range(self.num_users):
-            node_data = self.graph.nodes[node_id]
-            account_age_norm = node_data['account_age_days'] / 1825.0
-            risk_score = node_data['risk_score_initial']
-            node_features.append([account_age_norm, risk_score])
-            node_labels.append(node_data['is_fraud'])
-        
-        x = torch.tensor(node_features, dtype=torch.float)
-        y = torch.tensor(node_labels, dtype=torch.long)
-        
-        # Edge features
-        edge_list = []
-        edge_types = []
-        edge_attrs = []
-        
-        type_to_int = {t: i for i, t in enumerate(self.transaction_types)}
-        
-        for from_node, to_node, edge_data in self.graph.edges(data=True):
-            edge_list.append([from_node, to_node])
-            edge_type = type_to_int[edge_data['transaction_type']]
-            edge_types.append(edge_type)
-            edge_attrs.append([edge_data['amount'] / 5000.0])
-        
-        edge_index = torch.tensor(edge_list, dtype=torch.long).t().contiguous()
-        edge_type = torch.tensor(edge_types, dtype=torch.long)
-        edge_attr = torch.tensor(edge_attrs, dtype=torch.float)
+        """Convert the generated graph to PyTorch Geometric format.
+
+        The conversion is deterministic for a given graph state, so the
+        result is memoized against the (node, edge) counts; repeat calls
+        after generation is done return the same Data object.
+        """
+        signature = (self.graph.number_of_nodes(), self._edge_count)
+        if self._pyg_cache is not None and self._pyg_cache[0] == signature:
+            return self._pyg_cache[1]
+
+        # Node features come straight from the generation columns; the
+        # availability mask flips exactly when a user is marked fraud,
+        # so its complement is the label vector
+        features = np.empty((self.num_users, 2), dtype=np.float32)
+        features[:, 0] = self._ages * (1.0 / 1825.0)
+        features[:, 1] = self._risks
+        x = torch.from_numpy(features)
+        y = torch.from_numpy((~self._available).astype(np.int64))
+
+        # Edges come straight from the SoA columns recorded during
+        # generation — no second pass over the NetworkX edge dicts, and
+        # torch.from_numpy shares the buffers instead of copying.
+        src = self._edge_src[:self._edge_count]
+        dst = self._edge_dst[:self._edge_count]
+
+        # Sort by source (destination as tiebreak): message-passing
+        # kernels scatter over edge_index[0], and sorted sources turn
+        # their gathers/atomics into near-sequential access on every
+        # downstream forward pass
+        order = np.lexsort((dst, src))
+        edge_index = torch.from_numpy(np.stack([src[order], dst[order]]))
+        edge_type = torch.from_numpy(self._edge_type_id[:self._edge_count][order])
+        edge_attr = torch.from_numpy(
+            (self._edge_amount[:self._edge_count][order].astype(np.float32)
+             * (1.0 / 5000.0)).reshape(-1, 1)
+        )
         
         data = Data(
             x=x,
@@ -290,6 +500,7 @@ class EnhancedFinancialGraphGenerator:
             y=y
         )
         
+        self._pyg_cache = (signature, data)
         return data
 
 
@@ -300,6 +511,10 @@ def main():
     print("="*70)
     
     generator = EnhancedFinancialGraphGenerator(num_users=100)
+
+    # Upper bound on edges for the workload below (duplicates overwrite,
+    # so the filled prefix may end up slightly shorter)
+    generator.plan_capacity(5 + 8 + 15 + (4 + 4) + 300)
     
     print("\n[1/6] Generating user nodes...")
     generator.generate_user_features()
@@ -327,10 +542,27 @@ def main():
     print(f"\n[5/6] Saving data...")
     os.makedirs('data', exist_ok=True)
     
+    # The API's explainer agent still walks the NetworkX object, so the
+    # pickle stays — but with protocol 5, which is measurably faster on
+    # the nested node/edge dicts than the default
     with open('data/graph_enhanced.pkl', 'wb') as f:
-        pickle.dump(generator.graph, f)
+        pickle.dump(generator.graph, f, protocol=pickle.HIGHEST_PROTOCOL)
     print("✓ NetworkX graph saved to data/graph_enhanced.pkl")
-    
+
+    # Columnar dump of the SoA columns for consumers that only need the
+    # numbers: far smaller and faster to load than the object pickle
+    np.savez_compressed(
+        'data/graph_enhanced_columns.npz',
+        src=generator._edge_src[:generator._edge_count],
+        dst=generator._edge_dst[:generator._edge_count],
+        amount=generator._edge_amount[:generator._edge_count],
+        type_id=generator._edge_type_id[:generator._edge_count],
+        ages=generator._ages,
+        risks=generator._risks,
+        labels=(~generator._available).astype(np.int64),
+    )
+    print("✓ Edge/node columns saved to data/graph_enhanced_columns.npz")
+
     torch.save(pyg_data, 'data/graph_pyg_enhanced.pt')
     print("✓ PyTorch Geometric data saved to data/graph_pyg_enhanced.pt")
     
@@ -340,13 +572,14 @@ def main():
     print("="*70)
     print(f"Total users: {generator.num_users}")
     print(f"Total transactions: {generator.graph.number_of_edges()}")
-    print(f"Fraudulent users: {len(generator.fraud_users)}")
+    fraud_count = int((~generator._available).sum())
+    print(f"Fraudulent users: {fraud_count}")
     print(f"\nFraud Patterns Injected:")
     print(f"  💍 Cyclic Ring: 5 users")
     print(f"  📤 Fan-Out: 9 users (1 source + 8 targets)")
     print(f"  ⚡ Rapid-Fire: 1 user")
     print(f"  🔄 Scatter-Gather: 9 users (4 sources + hub + 4 targets)")
-    print(f"\nTotal fraud-involved users: {len(generator.fraud_users)}")
+    print(f"\nTotal fraud-involved users: {fraud_count}")
     print("="*70)
     print("\n✅ Enhanced data generation complete!\n")
 
@@ -12,7 +12,6 @@ Date: 2026-01-23
 
 import argparse
 from datetime import timedelta
-from auth import create_access_token
 
 
 def main():
@@ -33,7 +32,11 @@ def main():
     )
     
     args = parser.parse_args()
-    
+
+    # Imported here so --help and argument errors return instantly
+    # instead of paying for the JWT/passlib/dotenv import chain
+    from auth import create_access_token
+
     # Generate token
     token = create_access_token(
         data={"sub": args.user},
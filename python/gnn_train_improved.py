@@ -17,11 +17,19 @@ Date: 2026-01-23
 import torch
 import torch.nn.functional as F
 from torch_geometric.nn import RGCNConv
-from sklearn.metrics import classification_report, roc_auc_score, confusion_matrix
+
+# cugraph-ops backs RGCN aggregation with CSC kernels that are well
+# ahead of the stock scatter path on CUDA; fall back silently without it
+try:
+    import pylibcugraphops  # noqa: F401
+    from torch_geometric.nn import CuGraphRGCNConv
+    CUGRAPH_OPS_AVAILABLE = True
+except ImportError:
+    CUGRAPH_OPS_AVAILABLE = False
+from sklearn.metrics import roc_auc_score
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import json
+import os
 
 
 class ImprovedFraudRGCN(torch.nn.Module):
@@ -30,8 +38,10 @@ class ImprovedFraudRGCN(torch.nn.Module):
     def __init__(self, num_features, hidden_channels, num_relations, num_classes=2, dropout=0.3):
         super(ImprovedFraudRGCN, self).__init__()
         
-        self.conv1 = RGCNConv(num_features, hidden_channels, num_relations=num_relations)
-        self.conv2 = RGCNConv(hidden_channels, hidden_channels, num_relations=num_relations)
+        self.use_cugraph = CUGRAPH_OPS_AVAILABLE and torch.cuda.is_available()
+        conv_cls = CuGraphRGCNConv if self.use_cugraph else RGCNConv
+        self.conv1 = conv_cls(num_features, hidden_channels, num_relations=num_relations)
+        self.conv2 = conv_cls(hidden_channels, hidden_channels, num_relations=num_relations)
         self.lin = torch.nn.Linear(hidden_channels, num_classes)
         self.dropout = torch.nn.Dropout(p=dropout)
     
@@ -64,6 +74,8 @@ class ImprovedFraudDetectorTrainer:
         """
         self.data = data.to(device)
         self.device = device
+        # startswith, not equality: DDP ranks get 'cuda:N' device strings
+        self.autocast_enabled = str(device).startswith('cuda')
         
         # Create train/val/test masks
         num_nodes = data.num_nodes
@@ -80,6 +92,15 @@ class ImprovedFraudDetectorTrainer:
         self.data.val_mask[indices[train_size:train_size+val_size]] = True
         self.data.test_mask[indices[train_size+val_size:]] = True
         
+        # The splits never change during a run: keep their int64 index
+        # tensors (and the gathered training labels) so the loss and
+        # metric paths do a direct row gather instead of re-scanning a
+        # boolean mask over all N nodes every step
+        self.train_idx = self.data.train_mask.nonzero(as_tuple=False).view(-1)
+        self.val_idx = self.data.val_mask.nonzero(as_tuple=False).view(-1)
+        self.test_idx = self.data.test_mask.nonzero(as_tuple=False).view(-1)
+        self.y_train = self.data.y.index_select(0, self.train_idx).contiguous()
+        
         print(f"\n📊 Data Split:")
         print(f"  Train: {self.data.train_mask.sum()} nodes ({train_ratio*100:.0f}%)")
         print(f"  Val:   {self.data.val_mask.sum()} nodes ({val_ratio*100:.0f}%)")
@@ -95,7 +116,36 @@ class ImprovedFraudDetectorTrainer:
             num_relations=3,
             num_classes=2
         ).to(device)
-        
+
+        # Full-batch training reruns the same small forward 200 times,
+        # where per-op dispatch dominates; compile once (shapes never
+        # change, so dynamic=False avoids recompiles) and fall back to
+        # eager if Inductor can't handle the graph
+        if hasattr(torch, 'compile'):
+            try:
+                self.model = torch.compile(
+                    self.model, mode='reduce-overhead', fullgraph=False, dynamic=False
+                )
+            except Exception as e:
+                print(f"⚠️  torch.compile unavailable, training eager: {e}")
+
+        # Multi-GPU (torchrun): every rank holds the full graph, the
+        # training nodes are partitioned round-robin across ranks, and
+        # DDP all-reduces gradients each step. Class weights were
+        # computed above from the full split, so they agree on all ranks.
+        self.distributed = (
+            torch.distributed.is_available() and torch.distributed.is_initialized()
+        )
+        if self.distributed:
+            local_rank = torch.cuda.current_device()
+            self.model = torch.nn.parallel.DistributedDataParallel(
+                self.model, device_ids=[local_rank]
+            )
+            rank = torch.distributed.get_rank()
+            world_size = torch.distributed.get_world_size()
+            self.train_idx = self.train_idx[rank::world_size]
+            self.y_train = self.data.y.index_select(0, self.train_idx).contiguous()
+
         # Optimizer with weight decay
         self.optimizer = torch.optim.Adam(
             self.model.parameters(),
@@ -111,6 +161,17 @@ class ImprovedFraudDetectorTrainer:
             patience=10
         )
         
+        # cugraph convs consume a column-sorted EdgeIndex (CSC layout);
+        # convert once here so the COO-to-CSC sort isn't paid per forward
+        if getattr(self.model, 'use_cugraph', False):
+            from torch_geometric import EdgeIndex
+            edge_index = EdgeIndex(
+                self.data.edge_index, sparse_size=(num_nodes, num_nodes)
+            )
+            edge_index, perm = edge_index.sort_by('col')
+            self.data.edge_index = edge_index
+            self.data.edge_type = self.data.edge_type[perm]
+
         # Loss function with class weights
         self.criterion = torch.nn.NLLLoss(weight=self.class_weights)
         
@@ -119,52 +180,68 @@ class ImprovedFraudDetectorTrainer:
         self.patience_counter = 0
         self.best_model_state = None
     
+    def _unwrapped_model(self):
+        """The bare ImprovedFraudRGCN beneath the DDP/compile wrappers.
+
+        Checkpoints must carry the module's own parameter names: the DDP
+        wrapper prefixes every key with 'module.' and torch.compile with
+        '_orig_mod.', which would break plain load_state_dict consumers.
+        """
+        model = self.model
+        if isinstance(model, torch.nn.parallel.DistributedDataParallel):
+            model = model.module
+        return getattr(model, '_orig_mod', model)
+
     def _calculate_class_weights(self):
         """Calculate class weights based on training set only"""
-        y_train = self.data.y[self.data.train_mask].cpu().numpy()
-        class_counts = np.bincount(y_train)
+        # Computed on-device with torch.bincount: no NumPy round-trip,
+        # so no forced sync and H2D copy on CUDA
+        class_counts = torch.bincount(self.y_train, minlength=2).float()
         class_weights = 1.0 / class_counts
-        class_weights = class_weights / class_weights.sum() * len(class_counts)
-        
+        class_weights = class_weights / class_weights.sum() * class_counts.numel()
+
+        counts = class_counts.cpu().tolist()
+        weights = class_weights.cpu().tolist()
+        total = self.y_train.numel()
         print(f"\n⚖️  Training Set Class Distribution:")
-        print(f"  Normal: {class_counts[0]} ({class_counts[0]/len(y_train)*100:.1f}%)")
-        print(f"  Fraud:  {class_counts[1]} ({class_counts[1]/len(y_train)*100:.1f}%)")
-        print(f"  Class Weights: Normal={class_weights[0]:.2f}, Fraud={class_weights[1]:.2f}")
-        
-        return torch.tensor(class_weights, dtype=torch.float).to(self.device)
+        print(f"  Normal: {counts[0]:.0f} ({counts[0]/total*100:.1f}%)")
+        print(f"  Fraud:  {counts[1]:.0f} ({counts[1]/total*100:.1f}%)")
+        print(f"  Class Weights: Normal={weights[0]:.2f}, Fraud={weights[1]:.2f}")
+
+        return class_weights
     
     def train_epoch(self):
         """Train for one epoch on training set only"""
         self.model.train()
         self.optimizer.zero_grad()
-        
-        out = self.model(self.data.x, self.data.edge_index, self.data.edge_type)
-        loss = self.criterion(out[self.data.train_mask], self.data.y[self.data.train_mask])
-        
+
+        # bfloat16 autocast on CUDA halves the bytes moved by the
+        # bandwidth-bound message passing; gradients and optimizer state
+        # stay FP32 (bf16 keeps FP32's exponent range, so no GradScaler)
+        with torch.autocast(device_type='cuda', dtype=torch.bfloat16,
+                            enabled=self.autocast_enabled):
+            out = self.model(self.data.x, self.data.edge_index, self.data.edge_type)
+            loss = self.criterion(out.index_select(0, self.train_idx), self.y_train)
+
         loss.backward()
         self.optimizer.step()
         
         return loss.item()
     
     @torch.no_grad()
-    def evaluate(self, mask_name='val'):
-        """Evaluate on specific split"""
+    def _predict(self):
+        """One full-graph forward; every split's metrics slice its output"""
         self.model.eval()
-        
-        if mask_name == 'train':
-            mask = self.data.train_mask
-        elif mask_name == 'val':
-            mask = self.data.val_mask
-        else:  # test
-            mask = self.data.test_mask
-        
-        out = self.model(self.data.x, self.data.edge_index, self.data.edge_type)
-        pred = out.argmax(dim=1)
-        prob = torch.exp(out[:, 1])
-        
-        y_true = self.data.y[mask].cpu().numpy()
-        y_pred = pred[mask].cpu().numpy()
-        y_prob = prob[mask].cpu().numpy()
+        with torch.autocast(device_type='cuda', dtype=torch.bfloat16,
+                            enabled=self.autocast_enabled):
+            out = self.model(self.data.x, self.data.edge_index, self.data.edge_type)
+        return out.argmax(dim=1), torch.exp(out[:, 1].float())
+    
+    def _metrics_for(self, idx, pred, prob):
+        """Metrics for one split from already-computed predictions"""
+        y_true = self.data.y.index_select(0, idx).cpu().numpy()
+        y_pred = pred.index_select(0, idx).cpu().numpy()
+        y_prob = prob.index_select(0, idx).cpu().numpy()
         
         accuracy = (y_pred == y_true).sum() / len(y_true)
         
@@ -181,6 +258,19 @@ class ImprovedFraudDetectorTrainer:
             'true_labels': y_true
         }
     
+    @torch.no_grad()
+    def evaluate(self, mask_name='val'):
+        """Evaluate on specific split"""
+        if mask_name == 'train':
+            idx = self.train_idx
+        elif mask_name == 'val':
+            idx = self.val_idx
+        else:  # test
+            idx = self.test_idx
+        
+        pred, prob = self._predict()
+        return self._metrics_for(idx, pred, prob)
+    
     def train(self, epochs=200, print_every=20, patience=20):
         """Train with early stopping"""
         print("\n" + "="*50)
@@ -191,8 +281,11 @@ class ImprovedFraudDetectorTrainer:
             loss = self.train_epoch()
             
             if epoch % print_every == 0:
-                train_metrics = self.evaluate('train')
-                val_metrics = self.evaluate('val')
+                # The forward is split-independent: run it once and
+                # slice both masks from the same outputs
+                pred, prob = self._predict()
+                train_metrics = self._metrics_for(self.train_idx, pred, prob)
+                val_metrics = self._metrics_for(self.val_idx, pred, prob)
                 
                 print(f"Epoch {epoch:3d} | Loss: {loss:.4f} | "
                       f"Train Acc: {train_metrics['accuracy']:.4f} | "
@@ -206,9 +299,13 @@ class ImprovedFraudDetectorTrainer:
                 if val_metrics['accuracy'] > self.best_val_acc:
                     self.best_val_acc = val_metrics['accuracy']
                     self.patience_counter = 0
-                    self.best_model_state = self.model.state_dict().copy()
-                    torch.save(self.model.state_dict(), 'models/best_fraud_detector_improved.pt')
-                    print(f"  → ✓ New best model saved (Val Acc: {self.best_val_acc:.4f})")
+                    # Clone the tensors: a dict .copy() would still alias
+                    # the live parameters the optimizer keeps mutating
+                    self.best_model_state = {
+                        k: v.detach().clone()
+                        for k, v in self._unwrapped_model().state_dict().items()
+                    }
+                    print(f"  → ✓ New best model (Val Acc: {self.best_val_acc:.4f})")
                 else:
                     self.patience_counter += 1
                 
@@ -221,8 +318,17 @@ class ImprovedFraudDetectorTrainer:
         print("📊 FINAL TEST SET EVALUATION")
         print("="*50)
         
-        self.model.load_state_dict(torch.load('models/best_fraud_detector_improved.pt'))
-        test_metrics = self.evaluate('test')
+        # Restore the best weights from memory and persist them once at
+        # the end; saving on every improvement cost a device sync and
+        # disk write each time
+        if self.best_model_state is not None:
+            self._unwrapped_model().load_state_dict(self.best_model_state)
+            if not self.distributed or torch.distributed.get_rank() == 0:
+                torch.save(self.best_model_state, 'models/best_fraud_detector_improved.pt')
+        # Full-graph predictions from the restored best model, kept for
+        # callers (main's results JSON) so they don't rerun the forward
+        self.last_pred, self.last_prob = self._predict()
+        test_metrics = self._metrics_for(self.test_idx, self.last_pred, self.last_prob)
         
         print(f"\n✅ Test Results:")
         print(f"  Accuracy: {test_metrics['accuracy']:.4f}")
@@ -240,9 +346,20 @@ def main():
     data = torch.load('data/graph_pyg.pt', weights_only=False)
     print(f"✓ Loaded graph with {data.num_nodes} nodes and {data.num_edges} edges")
     
-    # Train model
-    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    # Train model: under torchrun, each rank drives one GPU and the
+    # trainer partitions the training nodes across ranks
+    world_size = int(os.environ.get('WORLD_SIZE', 1))
+    if world_size > 1:
+        torch.distributed.init_process_group(backend='nccl')
+        local_rank = int(os.environ.get('LOCAL_RANK', 0))
+        torch.cuda.set_device(local_rank)
+        device = f'cuda:{local_rank}'
+    else:
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
     print(f"🖥️  Using device: {device}")
+    # TF32 matmul on Ampere+ GPUs: ~8x matmul throughput at negligible
+    # precision cost for this task
+    torch.set_float32_matmul_precision('high')
     
     trainer = ImprovedFraudDetectorTrainer(data, device=device)
     test_metrics = trainer.train(epochs=200, print_every=20, patience=20)
@@ -250,12 +367,10 @@ def main():
     # Save results
     print("\n💾 Saving results...")
     
-    # Generate predictions for all nodes
-    trainer.model.eval()
-    with torch.no_grad():
-        out = trainer.model(data.x, data.edge_index, data.edge_type)
-        prob = torch.exp(out[:, 1]).cpu().numpy()
-        pred = out.argmax(dim=1).cpu().numpy()
+    # Full-node predictions were already computed by train() from the
+    # restored best model; reuse them instead of a third forward pass
+    prob = trainer.last_prob.cpu().numpy()
+    pred = trainer.last_pred.cpu().numpy()
     
     results = {
         'fraud_probability': prob.tolist(),
@@ -274,6 +389,9 @@ def main():
     print("✅ IMPROVED MODEL TRAINING COMPLETE!")
     print("="*50)
 
+    if world_size > 1:
+        torch.distributed.destroy_process_group()
+
 
 if __name__ == "__main__":
     main()
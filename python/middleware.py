@@ -0,0 +1,230 @@
+"""
+SentinAL: Pure-ASGI Middleware
+===============================
+Request-size limiting, security headers, and request logging implemented
+directly against the ASGI protocol.
+
+Starlette's @app.middleware("http") wraps every request in a
+BaseHTTPMiddleware layer that builds an extra Request/Response pair and
+spawns a coroutine per layer. These classes manipulate the raw
+http.response.start message instead, which removes that per-request
+overhead on every endpoint.
+
+Author: SentinAL Security Team
+Date: 2026-01-23
+"""
+
+import json
+import os
+import time
+from collections import deque
+
+from logging_config import get_logger, hash_sensitive_data
+
+# Redis is optional: the limiter degrades to an in-process window,
+# mirroring cache_manager's fallback behavior.
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = get_logger()
+
+MAX_REQUEST_SIZE = 1024 * 1024  # 1MB
+
+# Only these methods carry a body worth checking
+BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+]
+HSTS_HEADER = (b"strict-transport-security", b"max-age=31536000; includeSubDomains")
+
+
+class BodySizeLimitASGI:
+    """Reject oversized request bodies before they reach the app (DoS guard)."""
+
+    def __init__(self, app, max_size: int = MAX_REQUEST_SIZE):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        # Common case (GET-heavy traffic): no body, nothing to inspect
+        if scope["type"] != "http" or scope["method"] not in BODY_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = None
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = value
+                break
+
+        if content_length is not None and int(content_length) > self.max_size:
+            body = json.dumps({"error": True, "detail": "Request body too large"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        await self.app(scope, receive, send)
+
+
+class SecurityHeadersASGI:
+    """Append security headers to the raw http.response.start message."""
+
+    def __init__(self, app, environment: str = "development"):
+        self.app = app
+        self.headers = list(SECURITY_HEADERS)
+        # HSTS only in production
+        if environment == "production":
+            self.headers.append(HSTS_HEADER)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = self.headers
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+# Sliding-window limiter: prune entries older than the window, count what
+# remains, record this request, and refresh the key TTL — one round trip.
+RATE_LIMIT_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+redis.call('ZADD', key, now, now)
+redis.call('PEXPIRE', key, window)
+return count
+"""
+
+# Endpoints that carried @limiter.limit decorators before the ASGI rewrite.
+RATE_LIMITED_PREFIXES = ("/api/", "/analyze/")
+
+
+class RateLimitASGI:
+    """
+    Pure-ASGI sliding-window rate limiter keyed by client IP + path.
+
+    Runs a single Lua script round trip against Redis per request; when
+    Redis is unreachable it degrades to an in-process window so requests
+    are never failed by the limiter itself.
+    """
+
+    def __init__(self, app, limit: int = 10, window_seconds: int = 60):
+        self.app = app
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.window_ms = window_seconds * 1000
+        self.detail = f"Rate limit exceeded: {limit} per {window_seconds} second"
+        self._script = None
+        self._local_windows = {}
+
+        if REDIS_AVAILABLE:
+            try:
+                client = aioredis.Redis(
+                    host=os.getenv("REDIS_HOST", "localhost"),
+                    port=int(os.getenv("REDIS_PORT", "6379")),
+                    db=int(os.getenv("REDIS_DB", "0")),
+                    password=os.getenv("REDIS_PASSWORD", None),
+                    socket_connect_timeout=2,
+                )
+                # register_script handles EVALSHA with EVAL fallback
+                self._script = client.register_script(RATE_LIMIT_LUA)
+            except Exception as e:
+                logger.warning(f"Rate limiter falling back to in-memory window: {e}")
+
+    async def _over_limit(self, key: str) -> bool:
+        now_ms = int(time.time() * 1000)
+
+        if self._script is not None:
+            try:
+                count = await self._script(keys=[key], args=[now_ms, self.window_ms])
+                return count >= self.limit
+            except Exception as e:
+                logger.warning(f"Rate limiter falling back to in-memory window: {e}")
+                self._script = None
+
+        window = self._local_windows.setdefault(key, deque())
+        cutoff = now_ms - self.window_ms
+        while window and window[0] <= cutoff:
+            window.popleft()
+        if len(window) >= self.limit:
+            return True
+        window.append(now_ms)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(RATE_LIMITED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        key = f"ratelimit:{client[0] if client else 'unknown'}:{scope['path']}"
+
+        if await self._over_limit(key):
+            body = json.dumps({"error": self.detail}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.window_seconds).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        await self.app(scope, receive, send)
+
+
+class RequestLogASGI:
+    """Log each request and its response status without buffering either."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        logger.info(
+            f"Request: {scope['method']} {scope['path']}",
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "client_ip_hash": hash_sensitive_data(client[0]) if client else "unknown"
+            }
+        )
+
+        async def send_logged(message):
+            if message["type"] == "http.response.start":
+                logger.info(
+                    f"Response: {message['status']}",
+                    extra={"status_code": message["status"]}
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_logged)
@@ -8,6 +8,7 @@ Date: 2026-01-23
 """
 
 from typing import Optional, List, Dict, Any
+import msgspec
 from pydantic import BaseModel, Field, validator
 
 
@@ -101,6 +102,29 @@ class GraphResponse(BaseModel):
     links: List[GraphLink]
 
 
+# msgspec variants for the /api/graph hot path: Structs allocate in C and
+# msgspec.json.encode serializes the whole payload in one shot, so the
+# endpoint skips per-element Pydantic machinery entirely.
+class GraphNodeS(msgspec.Struct):
+    """Node in the transaction graph (serialization-only)"""
+    id: str
+    is_fraud: bool
+    risk_score: float
+    fraud_probability: float
+
+class GraphLinkS(msgspec.Struct):
+    """Edge/Transaction in the graph (serialization-only)"""
+    source: str
+    target: str
+    amount: float
+    is_laundering: bool
+
+class GraphResponseS(msgspec.Struct):
+    """Full graph data for visualization (serialization-only)"""
+    nodes: List[GraphNodeS]
+    links: List[GraphLinkS]
+
+
 class ErrorResponse(BaseModel):
     """
     Standard error response model.
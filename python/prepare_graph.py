@@ -0,0 +1,71 @@
+"""
+SentinAL: Graph Precompute Tool
+================================
+One-shot converter: reads the pickled NetworkX graph and writes flat
+array artifacts that load_data() can load via mmap at API startup.
+
+Unpickling the DiGraph allocates one Python dict per node/edge; the flat
+arrays load in milliseconds and let the kernel page attributes on demand.
+
+Usage:
+    python prepare_graph.py
+
+Author: SentinAL Project
+Date: 2025
+"""
+
+import pickle
+
+import numpy as np
+
+from agent_explainer import convert_graph_to_soa
+
+GRAPH_PKL = 'data/graph_enhanced.pkl'
+NODE_ATTRS_PATH = 'data/node_attrs.npy'
+EDGE_ATTRS_PATH = 'data/edge_attrs.npy'
+EDGE_TYPES_PATH = 'data/edge_types.npy'
+
+NODE_DTYPE = np.dtype([
+    ('node_id', 'i8'),
+    ('account_age_days', 'i4'),
+    ('risk_score_initial', 'f4'),
+    ('is_fraud', 'i1'),
+])
+EDGE_DTYPE = np.dtype([
+    ('src', 'i8'),
+    ('dst', 'i8'),
+    ('amount', 'f4'),
+    ('type_id', 'i2'),
+])
+
+
+def main():
+    print(f"Loading {GRAPH_PKL}...")
+    with open(GRAPH_PKL, 'rb') as f:
+        graph = pickle.load(f)
+    print(f"✓ {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
+
+    nodelist = list(graph.nodes())
+    soa = convert_graph_to_soa(graph, nodelist)
+
+    node_attrs = np.empty(len(nodelist), dtype=NODE_DTYPE)
+    node_attrs['node_id'] = nodelist
+    node_attrs['account_age_days'] = soa.account_age
+    node_attrs['risk_score_initial'] = soa.risk_score
+    node_attrs['is_fraud'] = soa.is_fraud
+
+    edge_attrs = np.empty(soa.edge_src.size, dtype=EDGE_DTYPE)
+    edge_attrs['src'] = soa.edge_src
+    edge_attrs['dst'] = soa.edge_dst
+    edge_attrs['amount'] = soa.edge_amount
+    edge_attrs['type_id'] = soa.edge_type_id
+
+    np.save(NODE_ATTRS_PATH, node_attrs)
+    np.save(EDGE_ATTRS_PATH, edge_attrs)
+    np.save(EDGE_TYPES_PATH, soa.edge_types)
+
+    print(f"✓ Wrote {NODE_ATTRS_PATH}, {EDGE_ATTRS_PATH}, {EDGE_TYPES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,7 +43,8 @@ class TestAuditLogging(unittest.TestCase):
     def test_log_creation(self):
         """Test that log file is created and contains valid JSON"""
         self.logger.log_event("TEST_EVENT", "user_123", "test_action", {"foo": "bar"})
-        
+        self.logger.flush()
+
         log_file = self.test_log_dir / "audit.jsonl"
         self.assertTrue(log_file.exists())
         
@@ -57,7 +58,8 @@ class TestAuditLogging(unittest.TestCase):
     def test_signature_verification(self):
         """Test that signatures are verified correctly"""
         self.logger.log_event("VALID_EVENT", "user_1", "valid")
-        
+        self.logger.flush()
+
         verifier = LogVerifier()
         results = verifier.scan_logs()
         self.assertEqual(results['valid'], 1)
@@ -66,7 +68,8 @@ class TestAuditLogging(unittest.TestCase):
     def test_tamper_detection(self):
         """Test that modified logs are detected as tampered"""
         self.logger.log_event("SENSITIVE_EVENT", "admin", "access")
-        
+        self.logger.flush()
+
         log_file = self.test_log_dir / "audit.jsonl"
         
         # Manually tamper with the file